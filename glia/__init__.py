@@ -9,13 +9,74 @@ whenever you change your NMODL code or simulator environment.
 
 __version__ = "4.0.1"
 
-from ._fs import get_cache_path as _get_cache_path
-from ._glia import Glia, MechId
-from .assets import Catalogue, Mod, Package
+import importlib
+import typing
+
+from . import exceptions as _exceptions
 from .exceptions import *
-from .neuron import MechAccessor
 
-_manager = Glia()
+if typing.TYPE_CHECKING:
+    from ._glia import Glia, MechId
+    from .assets import Catalogue, Mod, Package
+    from .neuron import MechAccessor
+
+# Public names that are only imported from their submodule when first accessed.
+_lazy_attrs = {
+    "Glia": "._glia",
+    "MechId": "._glia",
+    "Catalogue": ".assets",
+    "Mod": ".assets",
+    "Package": ".assets",
+    "MechAccessor": ".neuron",
+}
+
+# Listed explicitly, `from glia import *` can't see the lazy names otherwise.
+__all__ = [
+    *_lazy_attrs,
+    "insert",
+    "resolve",
+    "select",
+    "compile",
+    "load_library",
+    "context",
+    "catalogue",
+    "package",
+    "get_packages",
+    "get_cache_path",
+    *(
+        name
+        for name, obj in vars(_exceptions).items()
+        if isinstance(obj, type) and issubclass(obj, Exception)
+    ),
+]
+
+
+def _get_manager() -> "Glia":
+    global _manager
+
+    try:
+        return _manager
+    except NameError:
+        from ._glia import Glia
+
+        # The manager is created on first use, so that `import glia` stays cheap for
+        # callers that never touch the library (CLI help, docs builds, ...).
+        _manager = Glia()
+        return _manager
+
+
+def __getattr__(name):
+    if name == "_manager":
+        return _get_manager()
+    if name in _lazy_attrs:
+        value = getattr(importlib.import_module(_lazy_attrs[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
+def __dir__():
+    return sorted({*globals(), *_lazy_attrs, "_manager"})
 
 
 def insert(section, asset, variant=None, pkg=None, /, attributes=None, x=None):
@@ -36,14 +97,14 @@ def insert(section, asset, variant=None, pkg=None, /, attributes=None, x=None):
     :type x: float
     :raises: LibraryError if the asset isn't found or was incorrectly marked as a point process.
     """
-    return _manager.insert(section, asset, variant, pkg, attributes, x)
+    return _get_manager().insert(section, asset, variant, pkg, attributes, x)
 
 
 def resolve(asset, pkg=None, variant=None):
     """
     Resolve an asset selection command to the name known to NEURON.
     """
-    return _manager.resolve(asset, pkg=pkg, variant=variant)
+    return _get_manager().resolve(asset, pkg=pkg, variant=variant)
 
 
 def select(asset, pkg=None, variant=None):
@@ -57,28 +118,28 @@ def select(asset, pkg=None, variant=None):
     :param variant: Name of the variant to prefer.
     :type variant: string
     """
-    return _manager.select(asset, pkg=pkg, variant=variant)
+    return _get_manager().select(asset, pkg=pkg, variant=variant)
 
 
 def compile():
     """
     Compile and test all mod files found in all Glia packages.
     """
-    return _manager.compile()
+    return _get_manager().compile()
 
 
 def load_library():
     """
     Load the glia library (if it isn't loaded yet).
     """
-    return _manager.load_library()
+    return _get_manager().load_library()
 
 
 def context(assets=None, pkg=None, variant=None):
     """
     Creates a context that sets glia preferences during a `with` statement.
     """
-    return _manager.context(assets=assets, pkg=pkg, variant=variant)
+    return _get_manager().context(assets=assets, pkg=pkg, variant=variant)
 
 
 def catalogue(name):
@@ -88,7 +149,7 @@ def catalogue(name):
     :param name: Name of the Glia installed Arbor catalogue.
     :type name: str
     """
-    return _manager.catalogue(name)
+    return _get_manager().catalogue(name)
 
 
 def package(name):
@@ -98,14 +159,14 @@ def package(name):
     :param name: Name of the installed glia package.
     :type name: str
     """
-    return _manager.package(name)
+    return _get_manager().package(name)
 
 
 def get_packages():
     """
     Return all installed packages.
     """
-    return [*_manager.packages]
+    return [*_get_manager().packages]
 
 
 def get_cache_path():
@@ -115,4 +176,6 @@ def get_cache_path():
     Glia also stores a JSON cache in another directory, which
     you won't find here, but ``glia cache --clear`` can reset.
     """
+    from ._fs import get_cache_path as _get_cache_path
+
     return _get_cache_path()
@@ -1,14 +1,11 @@
-import shutil
+import sys
 from pathlib import Path
 
 import click
 
-from . import _manager, _mpi
+from . import _get_manager, _mpi
 from ._fs import clear_cache, get_cache_path, get_local_pkg_path
-from ._local import create_local_package
-from .assets import ModName
 from .exceptions import *
-from .packaging import PackageManager
 
 
 @click.group()
@@ -18,30 +15,33 @@ def glia():
 
 @glia.command(help="Compile the Glia library")
 def compile():
+    manager = _get_manager()
     if _mpi.main_node:
         click.echo("Glia is compiling...")
-    _manager.compile()
+    manager.compile()
     if _mpi.main_node:
         click.echo("Compilation complete!")
-    assets, _ = _manager._precompile_cache()
-    if _mpi.main_node:
+        # Ordered deduplication, so the listing is stable between runs.
+        compiled = dict.fromkeys(
+            (mod.pkg.name, mod.asset_name, mod.variant)
+            for mod in manager._collect_assets()
+        )
         click.echo(
             "Compiled assets: "
-            + ", ".join(
-                set(f"{mod.pkg.name}.{mod.asset_name}({mod.variant})" for mod in assets)
-            ),
+            + ", ".join(f"{pkg}.{asset}({variant})" for pkg, asset, variant in compiled),
         )
         click.echo("Testing assets ...")
-    test(_manager.resolver.index.keys())
+    test(tuple(manager.resolver.index))
 
 
 @glia.command("list", help="List installed components")
 def list_assets():
+    manager = _get_manager()
     click.echo(
         "Assets: "
-        + ", ".join(f"{e.name} ({len(e)})" for e in _manager.resolver.index.values()),
+        + ", ".join(f"{e.name} ({len(e)})" for e in manager.resolver.index.values()),
     )
-    click.echo("Packages: " + ", ".join(p.name for p in _manager.packages))
+    click.echo("Packages: " + ", ".join(p.name for p in manager.packages))
 
 
 @glia.command(help="Set global preferences for an asset.")
@@ -49,21 +49,22 @@ def list_assets():
 @click.option("-p", "--package", default=None, help="Package preference for this asset")
 @click.option("-v", "--variant", default=None, help="Variant preference for this asset")
 def select(asset, package, variant):
-    _manager.select(asset, pkg=package, variant=variant, glbl=True)
+    _get_manager().select(asset, pkg=package, variant=variant, glbl=True)
 
 
 @glia.command(help="Print info on an asset.")
 @click.argument("asset")
 def show(asset):
-    index = _manager.resolver.index
-    preferences = _manager.resolver._preferences()
+    manager = _get_manager()
+    index = manager.resolver.index
+    preferences = manager.resolver._preferences()
     if not asset in index:
         raise click.exceptions.BadArgumentUsage(f'Unknown ASSET "{asset}"')
     if asset in preferences:
         preference = preferences[asset]
         pref_mod = None
         try:
-            pref_mod = _manager.resolver.resolve_preference(asset)
+            pref_mod = manager.resolver.resolve_preference(asset)
         except ResolveError as e:
             click.echo("resolve error" + e)
             pass
@@ -75,60 +76,105 @@ def show(asset):
         click.echo("Current preferences: " + pref_string)
         click.echo("Current preferred module:" + pref_mod.mod_name)
     click.echo("Available modules:")
-    for mod in _manager.resolver.index[asset]:
+    for mod in manager.resolver.index[asset]:
         click.echo("  *" + mod.mod_name)
 
 
 @glia.command(help="Print info on a package.")
 @click.argument("package")
 def show_pkg(package):
-    candidates = [p for p in _manager.packages if p.name.find(package) != -1]
+    manager = _get_manager()
+    exact = manager.packages_by_name.get(package)
+    if exact is not None:
+        candidates = [exact]
+    else:
+        candidates = [p for p in manager.packages if package in p.name]
     if not len(candidates):
         raise click.exceptions.BadArgumentUsage(f'Unknown PACKAGE "{package}"')
+    lines = []
     for candidate in candidates:
-        click.echo("Package: " + click.style(candidate.name, fg="green"))
-        click.echo("=====")
-        click.echo(f"Location: {candidate.root}")
-        click.echo()
-        click.echo("Available modules:")
-        for mod in candidate.mods:
-            click.echo(f"  * {mod.mod_name} = {mod.path}")
-        click.echo()
+        lines.append("Package: " + click.style(candidate.name, fg="green"))
+        lines.append("=====")
+        lines.append(f"Location: {candidate.root}")
+        lines.append("")
+        lines.append("Available modules:")
+        lines.extend(f"  * {mod.mod_name} = {mod.path}" for mod in candidate.mods)
+        lines.append("")
+    click.echo("\n".join(lines))
 
 
 @glia.command(help="Test mechanisms")
 @click.argument("mechanisms", nargs=-1)
 def test(mechanisms, verbose=False):
-    if len(mechanisms) == 0:
-        mechanisms = _manager.resolver.index.keys()
-    successes = 0
+    manager = _get_manager()
+    # Snapshot the names once, all ranks index into the same sequence.
+    mechanisms = tuple(mechanisms or manager.resolver.index)
     tests = len(mechanisms)
+    # Each MPI rank tests its share of the mechanisms, the main node reports on all.
+    results = []
+    err = None
+    try:
+        share = range(_mpi.get_rank(), tests, _mpi.get_size())
+        # `test_mechanisms` loads the library on every rank, also for an empty share.
+        # Without any mechanisms to test there's no need to load it at all.
+        errors = manager.test_mechanisms(mechanisms[i] for i in share) if tests else {}
+        for i in share:
+            results.append((i, *_report_test(errors[mechanisms[i]])))
+    except Exception as e:
+        err = e
+    # Gather every rank's error too, the exit code has to account for all ranks.
+    all_results = _mpi.gather((results, None if err is None else repr(err)))
     ecode = 0
-    for mechanism in mechanisms:
-        mstr = "[OK]"
-        estr = ""
-        try:
-            _manager.test_mechanism(mechanism)
-            successes += 1
-        except LibraryError as e:
-            mstr = "[ERROR]"
-            estr = str(e)
-            ecode = 1
-        except UnknownAssetError as _:
-            mstr = "[?]"
-            ecode = 1
-        except TooManyMatchesError as e:
-            mstr = "[MULTI]"
-            estr = str(e)
-        except AssetLookupError as e:
-            mstr = "[X]"
-            estr = str(e)
-        click.echo(f"{mstr} {mechanism}")
-        if verbose and estr != "":
-            click.echo("  -- " + estr)
     if _mpi.main_node:
-        click.echo(f"Tests finished: {successes} out of {tests} passed")
-    exit(ecode)
+        rank_errors = [(r, e) for r, (_, e) in enumerate(all_results) if e is not None]
+        if rank_errors:
+            # Don't report a partial result as the outcome of the tests.
+            ecode = 1
+            if err is None:
+                for rank, e in rank_errors:
+                    click.echo(f"Tests aborted on rank {rank}: {e}", err=True)
+        else:
+            successes = 0
+            # Report in one write, instead of a flushed echo per mechanism.
+            lines = []
+            rank_results = sorted(r for rr, _ in all_results for r in rr)
+            for i, mstr, estr, passed, mcode in rank_results:
+                successes += passed
+                ecode = max(ecode, mcode)
+                lines.append(f"{mstr} {mechanisms[i]}")
+                if verbose and estr != "":
+                    lines.append("  -- " + estr)
+            lines.append(f"Tests finished: {successes} out of {tests} passed")
+            click.echo("\n".join(lines))
+    ecode = _mpi.bcast(ecode)
+    if err is not None:
+        raise err
+    sys.exit(ecode)
+
+
+def _report_test(error):
+    mstr = "[OK]"
+    estr = ""
+    passed = False
+    ecode = 0
+    if error is None:
+        passed = True
+    elif isinstance(error, LibraryError):
+        mstr = "[ERROR]"
+        estr = str(error)
+        ecode = 1
+    elif isinstance(error, UnknownAssetError):
+        mstr = "[?]"
+        ecode = 1
+    elif isinstance(error, TooManyMatchesError):
+        mstr = "[MULTI]"
+        estr = str(error)
+    elif isinstance(error, AssetLookupError):
+        mstr = "[X]"
+        estr = str(error)
+    else:
+        raise error
+    return mstr, estr, passed, ecode
 
 
 @glia.command(help="Build an Arbor catalogue")
@@ -145,7 +191,7 @@ def test(mechanisms, verbose=False):
 )
 @click.option("--gpu/--cpu", default=False, help="Build catalogue for GPU.")
 def build(catalogue, verbose, debug, gpu):
-    _manager.build_catalogue(catalogue, verbose=verbose, debug=debug, gpu=gpu)
+    _get_manager().build_catalogue(catalogue, verbose=verbose, debug=debug, gpu=gpu)
 
 
 @glia.command(help="Show or clear the cache path used in the current environment")
@@ -158,6 +204,8 @@ def build(catalogue, verbose, debug, gpu):
 def cache(clear):
     click.echo(get_cache_path())
     if clear:
+        import shutil
+
         clear_cache()
         shutil.rmtree(get_cache_path())
 
@@ -178,6 +226,8 @@ def new():
 
 def _guess_name(ctx, param, value):
     if value == param.default:
+        from .assets import ModName
+
         try:
             name = ModName.parse_path(ctx.params["source"])
             if param.name == "name":
@@ -241,6 +291,9 @@ def _guess_name(ctx, param, value):
     help="Restrict the usage of this NMODL file to the NEURON dialect.",
 )
 def add(source, name, variant, overwrite, target, local, dialect):
+    from ._local import create_local_package
+    from .packaging import PackageManager
+
     path = Path(get_local_pkg_path() if local else ".")
     if local and not path.exists():
         create_local_package()
@@ -4,6 +4,7 @@ import os
 import sys
 import typing
 import warnings
+from functools import lru_cache
 from pathlib import Path
 from traceback import format_exception
 
@@ -11,6 +12,11 @@ import appdirs
 
 from glia._hash import hash_path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 _install_dirs = appdirs.AppDirs(appname="Glia", appauthor="DBBS")
 
 LogLevel = typing.Union[
@@ -18,22 +24,42 @@ LogLevel = typing.Union[
 ]
 
 
+@lru_cache(maxsize=None)
+def _get_log_path(pid):
+    return Path(get_cache_path(f"{pid}.txt"))
+
+
+def get_log_path():
+    """
+    Get the path of the log file of the current process.
+    """
+    # Keyed by pid, so that forked processes get their own log file.
+    return _get_log_path(os.getpid())
+
+
 def log(message: str, *, level: LogLevel = None, category=None, exc: Exception = None):
-    log_path = Path(get_cache_path(f"{id('5')}.txt"))
+    log_path = get_log_path()
     if exc is not None and level is None:
         level = "error"
     if level:
         level = level.upper()
     header = " ".join(str(c) for c in (datetime.datetime.now(), level, category) if c)
-    log_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(log_path, "a") as f:
+    try:
+        f = open(log_path, "a")
+    except FileNotFoundError:
+        # Only create the cache directory when it's missing, instead of on every log.
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        f = open(log_path, "a")
+    with f:
         f.write(f"[{header}] {message}")
         if exc:
             f.write(":\n")
-            f.writelines(
-                "  " + "\n  ".join(line.split("\n"))
-                for line in format_exception(type(exc), exc, exc.__traceback__)
-            )
+            write = f.write
+            # Formatted frames span several lines, indent each of them.
+            for line in format_exception(type(exc), exc, exc.__traceback__):
+                for subline in line.splitlines(keepends=True):
+                    write("  ")
+                    write(subline)
             f.write("Exception arguments:\n")
             f.writelines(f"  {a}\n" for a in exc.args)
             warnings.warn(message + f". See the full log at '{log_path}'.")
@@ -41,26 +67,40 @@ def log(message: str, *, level: LogLevel = None, category=None, exc: Exception =
             f.write("\n")
 
 
+@lru_cache(maxsize=None)
 def get_glia_path():
     from . import __path__
 
     return __path__[0]
 
 
+@lru_cache(maxsize=None)
 def get_cache_hash(prefix=""):
-    return prefix + hash_path(get_glia_path())[:8] + hash_path(sys.prefix)[:8]
+    return prefix + hash_path(get_glia_path()) + hash_path(sys.prefix)
+
+
+@lru_cache(maxsize=None)
+def _get_cache_root(prefix):
+    return os.path.join(_install_dirs.user_cache_dir, get_cache_hash(prefix))
+
+
+@lru_cache(maxsize=None)
+def _get_data_root():
+    return _install_dirs.user_data_dir
 
 
 def get_cache_path(*subfolders, prefix=""):
-    return os.path.join(
-        _install_dirs.user_cache_dir,
-        get_cache_hash(prefix),
-        *subfolders,
-    )
+    root = _get_cache_root(prefix)
+    if not subfolders:
+        return root
+    return os.path.join(root, *subfolders)
 
 
 def get_data_path(*subfolders):
-    return os.path.join(_install_dirs.user_data_dir, *subfolders)
+    root = _get_data_root()
+    if not subfolders:
+        return root
+    return os.path.join(root, *subfolders)
 
 
 def get_neuron_mod_path(*paths):
@@ -73,19 +113,56 @@ def get_local_pkg_path():
     return get_data_path(__version__.split(".")[0], "local")
 
 
+# Contents of the shared storage files read or written by this process, keyed by path,
+# along with the `(mtime, size)` of the file they were read from.
+_storage_cache = {}
+
+
+def _stat_key(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _json_dumps(data) -> bytes:
+    if orjson is not None:
+        # Coerce non-string keys, like the standard library does.
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    else:
+        return json.dumps(data).encode()
+
+
+def _json_loads(content: bytes):
+    # `orjson.JSONDecodeError` subclasses `json.JSONDecodeError`.
+    if orjson is not None:
+        return orjson.loads(content)
+    else:
+        return json.loads(content)
+
+
 def _read_shared_storage(*path):
     _path = get_data_path(*path)
     try:
-        with open(_path, "r") as f:
-            return json.load(f)
+        key = _stat_key(_path)
+        cached = _storage_cache.get(_path)
+        if cached is not None and cached[0] == key:
+            content = cached[1]
+        else:
+            with open(_path, "rb") as f:
+                content = f.read()
+            _storage_cache[_path] = (key, content)
+        # Parse on every read: callers mutate the returned data, and parsing is cheaper
+        # than deep copying a cached object.
+        return _json_loads(content)
     except (IOError, json.JSONDecodeError):
         return {}
 
 
 def _write_shared_storage(data, *path):
     _path = get_data_path(*path)
-    with open(_path, "w") as f:
-        f.write(json.dumps(data))
+    content = _json_dumps(data)
+    with open(_path, "wb") as f:
+        f.write(content)
+    _storage_cache[_path] = (_stat_key(_path), content)
 
 
 def read_storage(*path):
@@ -97,9 +174,11 @@ def read_storage(*path):
 
 
 def write_storage(data, *path):
-    _path = get_data_path(*path)
     glia_path = get_glia_path()
     shared_data = _read_shared_storage(*path)
+    if glia_path in shared_data and shared_data[glia_path] == data:
+        # Unchanged, skip the write.
+        return
     shared_data[glia_path] = data
     _write_shared_storage(shared_data, *path)
 
@@ -115,12 +194,6 @@ def write_cache(cache_data):
     write_storage(cache_data, "cache.json")
 
 
-def update_cache(cache_data):
-    cache = read_cache()
-    cache.update(cache_data)
-    write_cache(cache)
-
-
 def clear_cache():
     empty_cache = {"mod_hashes": {}, "cat_hashes": {}}
     write_cache(empty_cache)
@@ -1,18 +1,18 @@
+import errno
 import os
 import shutil
 import subprocess
 import sys
 import typing
 import warnings
-from functools import lru_cache, wraps
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache, wraps
 from pathlib import Path
-from shutil import copy2 as copy_file
-from shutil import rmtree as rmdir
-
-from importlib_metadata import entry_points
+from shutil import copyfile
 
 from . import _mpi
 from ._fs import (
+    _stat_key,
     clear_cache,
     create_preferences,
     get_cache_path,
@@ -21,15 +21,25 @@ from ._fs import (
     get_neuron_mod_path,
     log,
     read_cache,
-    update_cache,
+    write_cache,
 )
 from ._local import create_local_package
 from .assets import Mod, Package
-from .exceptions import CompileError, LibraryError, NeuronError, PackageError
+from .exceptions import (
+    CompileError,
+    LibraryError,
+    NeuronError,
+    PackageError,
+    ResolveError,
+)
 from .neuron import MechAccessor
 from .resolution import Resolver
 
 _installed = None
+# Hash the mods of more packages than this on a thread pool.
+_parallel_hash_threshold = 4
+# Link or copy more mod files than this on a thread pool.
+_parallel_copy_threshold = 4
 
 MechId = typing.Union[
     str, typing.Tuple[str], typing.Tuple[str, str], typing.Tuple[str, str, str]
@@ -39,7 +49,8 @@ MechId = typing.Union[
 def _requires_install(func):
     @wraps(func)
     def wrapper(self, *args, **kwargs):
-        if not self._is_installed():
+        # Only check the filesystem until the installation has been confirmed once.
+        if not _installed and not self._is_installed():
             self._install_self()
         return func(self, *args, **kwargs)
 
@@ -56,12 +67,43 @@ def _requires_library(func):
     return wrapper
 
 
+def _env_flag(name):
+    return os.environ.get(name, "").upper() in ("1", "TRUE", "ON")
+
+
 def _should_skip_compile():
-    return os.environ.get("GLIA_NOCOMPILE", "").upper() in ("1", "TRUE", "ON")
+    return _env_flag("GLIA_NOCOMPILE")
 
 
 def _should_skip_load():
-    return os.environ.get("GLIA_NOLOAD", "").upper() in ("1", "TRUE", "ON")
+    return _env_flag("GLIA_NOLOAD")
+
+
+@lru_cache(maxsize=None)
+def _get_entry_points(group):
+    # Scanning the metadata of every installed distribution is slow, do it once per
+    # process and group.
+    from importlib_metadata import entry_points
+
+    return tuple(entry_points(group=group))
+
+
+@lru_cache(maxsize=1)
+def _get_build_fingerprint():
+    # The compiled library is only valid for the platform and NEURON version that
+    # `nrnivmodl` built it with. Read the version from the distribution metadata, so
+    # that checking the cache doesn't import NEURON.
+    from importlib_metadata import PackageNotFoundError, version
+
+    for dist in ("NEURON", "NEURON-nightly", "NEURON-gpu", "NEURON-gpu-nightly"):
+        try:
+            nrn_version = version(dist)
+            break
+        except PackageNotFoundError:
+            pass
+    else:
+        nrn_version = None
+    return f"{sys.platform}-{nrn_version}"
 
 
 class Glia:
@@ -80,15 +122,27 @@ class Glia:
             self._resolver = Resolver(self)
         return self._resolver
 
-    @property
-    @lru_cache(maxsize=1)
+    @cached_property
     def packages(self):
         return self.discover_packages()
 
+    @cached_property
+    def packages_by_name(self) -> typing.Dict[str, Package]:
+        index = {}
+        for pkg in self.packages:
+            index.setdefault(pkg.name, pkg)
+        return index
+
+    @cached_property
+    def _user_packages(self) -> typing.List[Package]:
+        # The packages with mod files to compile.
+        return [pkg for pkg in self.packages if not pkg.builtin]
+
     def discover_packages(self) -> typing.List[Package]:
         packages = []
-        eps = entry_points()
-        for pkg_ptr in eps.select(group="glia.package"):
+        # Loaded one by one, imports don't gain from threads and package imports may
+        # not be safe to run concurrently.
+        for pkg_ptr in _get_entry_points("glia.package"):
             self.entry_points.append(pkg_ptr)
             try:
                 packages.append(pkg_ptr.load())
@@ -97,11 +151,10 @@ class Glia:
         return packages
 
     def get_package(self, name: str):
-        for pkg in self.packages:
-            if pkg.name == name:
-                return pkg
-        else:
-            raise KeyError(f"Package '{name}' not found.")
+        try:
+            return self.packages_by_name[name]
+        except KeyError:
+            raise KeyError(f"Package '{name}' not found.") from None
 
     @_requires_install
     def catalogue(self, name: str):
@@ -118,11 +171,10 @@ class Glia:
 
     @_requires_install
     def package(self, name) -> Package:
-        for pkg in self.packages:
-            if pkg.name == name:
-                return pkg
-        else:
-            raise PackageError(f"Package '{name}' not found.")
+        try:
+            return self.packages_by_name[name]
+        except KeyError:
+            raise PackageError(f"Package '{name}' not found.") from None
 
     @_requires_install
     def load_library(self):
@@ -140,24 +192,47 @@ class Glia:
         :param check_cache: If true, the cache is checked and compilation is only performed if it is stale.
         :type check_cache: boolean
         """
+        if check_cache and self._compiled:
+            # Already compiled, or found fresh, by this process.
+            return
+        mod_hashes = None
+        if check_cache:
+            # Reuse the mod hashes of the check, if any, to update a stale cache.
+            fresh, mod_hashes = self._check_cache()
+            if fresh:
+                self._compiled = True
+                return
+        if _mpi.main_node:
+            self._compile(mod_hashes)
+        _mpi.barrier()
+        # Only set once compilation succeeded, so that a failed attempt is retried.
         self._compiled = True
-        if not check_cache or not self.is_cache_fresh():
-            if _mpi.main_node:
-                self._compile()
-            _mpi.barrier()
 
     @_requires_install
-    def _compile(self):
-        assets, cache_data = self._precompile_cache()
+    def _compile(self, mod_hashes=None):
+        cache_data = self._current_cache_data(mod_hashes)
+        # Mods are only collected once we know they have to be compiled.
+        assets = self._collect_assets()
         if _should_skip_compile():
-            return update_cache(cache_data)
+            return write_cache(cache_data)
         if len(assets) == 0:
-            return
+            # Nothing to compile, record that so the next cache check finds it fresh.
+            return write_cache(cache_data)
         neuron_mod_path = get_neuron_mod_path()
         _remove_tree(neuron_mod_path)
-        # Copy over fresh mods
-        for asset in assets:
-            copy_file(asset.path, neuron_mod_path)
+        # Link or copy over fresh mods, only their contents matter to `nrnivmodl`.
+        # Later mods with the same file name overwrite earlier ones, as they would
+        # when copied one after the other.
+        targets = {
+            os.path.join(neuron_mod_path, asset.path.name): asset.path for asset in assets
+        }
+        if len(targets) > _parallel_copy_threshold:
+            with _thread_pool(len(targets)) as pool:
+                # Consume the results, to raise any errors.
+                [*pool.map(_link_or_copy, targets.values(), targets.keys())]
+        else:
+            for dst, src in targets.items():
+                _link_or_copy(src, dst)
         # Platform specific compile
         if sys.platform == "win32":
             self._compile_nrn_windows(neuron_mod_path)
@@ -168,22 +243,23 @@ class Glia:
                 "Only linux and win32 are supported. You are using " + sys.platform
             )
         # Update the cache with the new mod directory hashes.
-        update_cache(cache_data)
+        write_cache(cache_data)
 
     def _compile_nrn_windows(self, neuron_mod_path):
         # Compile the glia cache for Linux.
         # Runs %NEURONHOME%/nrnivmodl.bat
         from patch import p
 
-        process = subprocess.Popen(
-            [os.path.join(p.neuronhome(), "bin", "nrnivmodl.bat")],
-            cwd=neuron_mod_path,
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-
-        stdout, stderr = process.communicate(input=b"\n")
+        with open(_get_compile_log_path(neuron_mod_path), "wb") as stdout:
+            process = subprocess.Popen(
+                [os.path.join(p.neuronhome(), "bin", "nrnivmodl.bat")],
+                cwd=neuron_mod_path,
+                stdin=subprocess.PIPE,
+                stdout=stdout,
+                stderr=subprocess.PIPE,
+            )
+            # The batch script waits for a keypress when it's done.
+            _, stderr = process.communicate(input=b"\n")
         self._compilation_failed = process.returncode != 0
         if process.returncode != 0:
             raise CompileError(stderr.decode("UTF-8"))
@@ -191,37 +267,71 @@ class Glia:
     def _compile_nrn_linux(self, neuron_mod_path):
         # Compile the glia cache for Linux.
         # Runs nrnivmodl.
-        process = subprocess.Popen(
-            ["nrnivmodl"],
-            cwd=neuron_mod_path,
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-
-        stdout, stderr = process.communicate()
+        with open(_get_compile_log_path(neuron_mod_path), "wb") as stdout:
+            process = subprocess.Popen(
+                ["nrnivmodl"],
+                cwd=neuron_mod_path,
+                stdin=subprocess.DEVNULL,
+                stdout=stdout,
+                stderr=subprocess.PIPE,
+            )
+            _, stderr = process.communicate()
         self._compiled = process.returncode == 0
         if process.returncode != 0:
             raise CompileError(stderr.decode("UTF-8"))
 
-    def _precompile_cache(self):
-        cache_data = read_cache()
+    def _collect_assets(self):
         assets = []
         # Iterate over all discovered packages to collect the mod files.
-        for pkg in self.packages:
-            if pkg.builtin:
-                continue
+        for pkg in self._user_packages:
             assets.extend(pkg.get_mods(dialect="neuron"))
-            # Update the package's hash to the current modfile contents
-            cache_data["mod_hashes"][pkg.hash] = pkg.mod_hash
-        return assets, cache_data
+        return assets
+
+    def _hash_mods(self, cache_data=None):
+        # Map each package's hash to the hash of its current modfile contents, and the
+        # modfile stats it was computed for.
+        if cache_data is None:
+            cache_data = read_cache()
+        mod_stats = cache_data.get("mod_stats", {})
+        mod_hashes = {}
+        stale = []
+        for pkg in self._user_packages:
+            stats = _get_mod_stats(pkg)
+            cached = mod_stats.get(pkg.hash)
+            if stats is not None and cached is not None and cached[0] == stats:
+                # The modfiles are unchanged since they were last hashed.
+                mod_hashes[pkg.hash] = (cached[1], stats)
+            else:
+                stale.append((pkg, stats))
+        if len(stale) > _parallel_hash_threshold:
+            with _thread_pool(len(stale)) as pool:
+                stale_hashes = [*pool.map(lambda pair: pair[0].mod_hash, stale)]
+        else:
+            stale_hashes = [pkg.mod_hash for pkg, _ in stale]
+        for (pkg, stats), mod_hash in zip(stale, stale_hashes):
+            mod_hashes[pkg.hash] = (mod_hash, stats)
+        return mod_hashes
+
+    def _current_cache_data(self, mod_hashes=None):
+        # The full cache with this compilation's updates, written back as a whole.
+        cache_data = read_cache()
+        if mod_hashes is None:
+            mod_hashes = self._hash_mods()
+        mod_stats = cache_data.setdefault("mod_stats", {})
+        # Update the packages' hashes to the current modfile contents
+        for pkg_hash, (mod_hash, stats) in mod_hashes.items():
+            cache_data["mod_hashes"][pkg_hash] = mod_hash
+            mod_stats[pkg_hash] = [stats, mod_hash]
+        cache_data["build_fingerprint"] = _get_build_fingerprint()
+        return cache_data
 
     def _resolve_mod(self, asset, variant=None, pkg=None):
+        resolver = self.resolver
         if isinstance(asset, str) and asset.startswith("glia__"):
             mod_name = asset
         else:
-            mod_name = self.resolver.resolve(asset, pkg=pkg, variant=variant)
-        return self.resolver.lookup(mod_name)
+            mod_name = resolver.resolve(asset, pkg=pkg, variant=variant)
+        return resolver.lookup(mod_name)
 
     @_requires_library
     def test_mechanism(self, mechanism):
@@ -234,18 +344,42 @@ class Glia:
         :rtype: boolean
         :raises: LibraryError if the mechanism can't be inserted.
         """
+        self._test_mechanism(mechanism)
+        return True
+
+    @_requires_library
+    def test_mechanisms(self, mechanisms):
+        """
+        Test several mechanisms like :meth:`test_mechanism`, collecting their errors.
+
+        :param mechanisms: Fully qualified NEURON names of the mechanisms.
+        :type mechanisms: Iterable[str]
+        :returns: The error each mechanism failed with, or None if it passed.
+        :rtype: Dict[str, Optional[GliaError]]
+        """
+        results = {}
+        for mechanism in mechanisms:
+            try:
+                self._test_mechanism(mechanism)
+            except (LibraryError, ResolveError) as e:
+                results[mechanism] = e
+            else:
+                results[mechanism] = None
+        return results
+
+    def _test_mechanism(self, mechanism):
         try:
-            s = self.h.Section()
             mod = self._resolve_mod(mechanism)
             if mod.is_artificial_cell:
                 getattr(self.h, mod.mod_name)
             else:
-                self.insert(s, mechanism)
+                # A fresh Section per test, so that mechanisms can't interfere, for
+                # example by writing the same ion concentration.
+                self.insert(self.h.Section(), mechanism)
         except ValueError as e:
-            if str(e).find("argument not a density mechanism name") != -1:
+            if _is_unknown_density_mechanism_error(e):
                 raise LibraryError(mechanism + " mechanism could not be inserted.")
             raise
-        return True
 
     @_requires_library
     def insert(
@@ -288,7 +422,7 @@ class Glia:
                     "'{}' point process not found ".format(mod.mod_name)
                 ) from None
             except TypeError as e:
-                if str(e).find("'dict_keys' object is not subscriptable") == -1:
+                if "'dict_keys' object is not subscriptable" not in str(e):
                     raise
                 else:
                     raise LibraryError(
@@ -300,7 +434,7 @@ class Glia:
             try:
                 section.insert(mod.mod_name)
             except ValueError as e:
-                if str(e).find("argument not a density mechanism name") != -1:
+                if _is_unknown_density_mechanism_error(e):
                     raise LibraryError(f"'{mod.mod_name}' mechanism not found") from None
             ma = MechAccessor(section, mod)
         if attributes is not None:
@@ -364,8 +498,16 @@ class Glia:
             self._loaded = True
             if _should_skip_load():
                 return
-            for path in self.get_libraries():
-                dll_result = self.h.nrn_load_dll(path)
+            paths = self.get_libraries()
+            missing = [path for path in paths if not os.path.exists(path)]
+            if missing:
+                raise NeuronError(
+                    "Library files not found, try recompiling with `glia compile`: "
+                    + ", ".join(f"'{path}'" for path in missing)
+                )
+            load_dll = self.h.nrn_load_dll
+            for path in paths:
+                dll_result = load_dll(path)
                 if not dll_result:
                     raise NeuronError(
                         f"Library file could not be loaded into NEURON. Path: '{path}'"
@@ -383,17 +525,24 @@ class Glia:
         return [get_neuron_mod_path(*path)]
 
     def is_cache_fresh(self) -> bool:
+        return self._check_cache()[0]
+
+    def _check_cache(self):
+        # Returns whether the cache is fresh, and the mod hashes if they were computed.
+        cache_data = read_cache()
+        if cache_data.get("build_fingerprint") != _get_build_fingerprint():
+            return False, None
+        cached_hashes = cache_data["mod_hashes"]
+        if not {pkg.hash for pkg in self._user_packages} <= cached_hashes.keys():
+            # Packages were added, no need to hash anything to know it's stale.
+            return False, None
         try:
-            cache_data = read_cache()
-            mod_hashes = cache_data["mod_hashes"]
-            for pkg in self.packages:
-                if pkg.hash not in mod_hashes:
-                    return False
-                if pkg.mod_hash != mod_hashes[pkg.hash]:
-                    return False
-            return True
-        except FileNotFoundError as _:
-            return False
+            mod_hashes = self._hash_mods(cache_data)
+        except FileNotFoundError:
+            # Stale, `_compile` will report the missing modfile.
+            return False, None
+        fresh = all(cached_hashes[k] == v[0] for k, v in mod_hashes.items())
+        return fresh, mod_hashes
 
     def _is_installed(self):
         global _installed
@@ -422,48 +571,115 @@ class Glia:
         except ImportError:
             pass
         else:
-            import patch
-            from patch import is_density_mechanism, is_point_process
-
             nrn_pkg = Package("NEURON", Path(neuron.__path__[0]), builtin=True)
-            builtin_mechs = []
-            # Get all the builtin mechanisms by triggering a TypeError (NEURON 7.7 or
-            # below) Or by it being a "DensityMechanism" (NEURON 7.8 or above)
-            for key in dir(h):
-                if is_density_mechanism(key):
-                    builtin_mechs.append((key, False))
-                elif is_point_process(key):
-                    builtin_mechs.append((key, True))
-            for mech, point_process in builtin_mechs:
-                mod = Mod(
-                    None, mech, variant=0, builtin=True, is_point_process=point_process
-                )
-                nrn_pkg.mods.append(mod)
+            nrn_pkg.mods.extend(
+                Mod(None, mech, variant=0, builtin=True, is_point_process=point_process)
+                for mech, point_process in _get_builtin_mechanisms(h)
+            )
             self.packages.append(nrn_pkg)
-            if self.resolver:
-                self.resolver.construct_index()
+            self.__dict__.pop("packages_by_name", None)
+            self.__dict__.pop("_user_packages", None)
+            # An existing resolver only needs the new package, a resolver created later
+            # will index all packages, including this one.
+            if self._resolver is not None:
+                self._resolver.index_package(nrn_pkg)
+
+
+def _get_mod_stats(pkg):
+    # Modification times and sizes of the package's modfiles, in the same form as they
+    # are stored in the cache JSON. None if a modfile is missing.
+    try:
+        return [[str(mod.path), *_stat_key(mod.path)] for mod in pkg.mods]
+    except FileNotFoundError:
+        return None
+
+
+def _is_unknown_density_mechanism_error(e):
+    # NEURON raises a ValueError with this message from `Section.insert`.
+    return "argument not a density mechanism name" in str(e)
+
+
+# Errors of `os.link` for which a copy can be made instead.
+_link_unsupported_errnos = {
+    errno.EXDEV,
+    errno.EPERM,
+    errno.ENOTSUP,
+    errno.EOPNOTSUPP,
+    errno.EMLINK,
+}
+
+
+def _link_or_copy(src, dst):
+    # `nrnivmodl` only reads the mod files, so a hard link avoids copying them. Links
+    # can't cross filesystems, or may not be supported, copy the file then.
+    # A file left behind at `dst` may be a link to another package's mod file, remove it
+    # so that nothing is ever written through it.
+    try:
+        os.unlink(dst)
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(src, dst)
+    except OSError as e:
+        if e.errno not in _link_unsupported_errnos:
+            raise
+        copyfile(src, dst)
 
 
-def _transform(obj):
-    # Transform an object to its NEURON counterpart, if possible, otherwise
-    # return the object itself.
+def _get_compile_log_path(neuron_mod_path):
+    # The verbose compiler output is written straight to a file instead of being
+    # buffered in memory, only stderr is kept to report errors.
+    return os.path.join(neuron_mod_path, "compile.log")
 
-    # Does the given object expose a method to convert it into a  NEURON representation?
-    if hasattr(obj, "__neuron__"):
-        # Transform the given object into its NEURON representation.
-        obj = obj.__neuron__()
-    return obj
+
+# Mechanisms that every section has, and that can't be inserted.
+_internal_mechanisms = ("morphology", "capacitance")
+
+
+def _get_builtin_mechanisms(h):
+    """
+    Enumerate the density mechanisms and point processes known to NEURON, through its
+    ``MechanismType`` API instead of probing every name on the HocInterpreter.
+
+    :returns: Sorted ``(name, is_point_process)`` pairs.
+    """
+    name = h.ref("")
+    mechs = []
+    for point_process in (False, True):
+        mt = h.MechanismType(int(point_process))
+        for i in range(int(mt.count())):
+            # Artificial cells aren't inserted into sections.
+            if point_process and mt.is_artificial(i):
+                continue
+            mt.select(i)
+            mt.selected(name)
+            if name[0] not in _internal_mechanisms:
+                mechs.append((name[0], point_process))
+    return sorted(mechs)
 
 
 def _remove_tree(path):
-    for root, dirs, files in os.walk(path):
-        for dir in dirs:
-            try:
-                rmdir(os.path.join(path, dir))
-            except PermissionError as _:
-                pass
-        for file in files:
-            try:
-                os.remove(os.path.join(path, file))
-            except PermissionError as _:
-                warnings.warn(f"Couldn't remove {file}")
+    # Empty the directory by removing it entirely and recreating it.
+    if sys.version_info >= (3, 12):
+        shutil.rmtree(path, onexc=_warn_remove_error)
+    else:
+        shutil.rmtree(
+            path, onerror=lambda f, p, exc_info: _warn_remove_error(f, p, exc_info[1])
+        )
+    os.makedirs(path, exist_ok=True)
+
+
+def _warn_remove_error(func, path, exc):
+    if isinstance(exc, FileNotFoundError):
+        return
+    elif isinstance(exc, PermissionError):
+        # Files can be locked, for example a library loaded by NEURON on Windows.
+        warnings.warn(f"Couldn't remove {path}")
+    elif func is not os.rmdir:
+        # Directories that still contain locked files can't be removed, skip those.
+        raise exc
+
+
+def _thread_pool(tasks):
+    # Don't start more threads than there are tasks, nor than the usual I/O bound cap.
+    return ThreadPoolExecutor(max_workers=min(32, tasks))
@@ -1,32 +1,78 @@
-try:
-    import mpi4py.MPI
-
-    _comm = mpi4py.MPI.COMM_WORLD
-    # When mocked this TypeErrors
-    parallel_run = _comm.Get_size() > 1
-except (ImportError, TypeError):
-    _comm = None
-    has_mpi = False
-    main_node = True
-    parallel_run = False
-else:
-    has_mpi = True
-    main_node = not _comm.Get_rank()
+_comm = None
+_initialized = False
+
+
+def _init():
+    # Importing `mpi4py.MPI` initializes MPI, which is slow, so it is deferred until the
+    # first time MPI state is needed.
+    global _initialized, _comm, has_mpi, main_node, parallel_run
+
+    if _initialized:
+        return
+    _initialized = True
+    try:
+        import mpi4py.MPI
+
+        _comm = mpi4py.MPI.COMM_WORLD
+        # When mocked this TypeErrors
+        parallel_run = _comm.Get_size() > 1
+    except (ImportError, TypeError):
+        _comm = None
+        has_mpi = False
+        main_node = True
+        parallel_run = False
+    else:
+        has_mpi = True
+        main_node = not _comm.Get_rank()
+
+
+def __getattr__(name):
+    if name in ("has_mpi", "main_node", "parallel_run"):
+        _init()
+        return globals()[name]
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
+def _get_comm():
+    _init()
+    return _comm
 
 
 def set_comm(comm):
     global _comm
 
+    _init()
     _comm = comm
 
 
 def barrier():
-    if _comm:
+    if _get_comm():
         _comm.barrier()
 
 
 def bcast(data, root=0):
-    if not _comm:
+    if not _get_comm():
         return data
     else:
         return _comm.bcast(data, root=root)
+
+
+def get_rank():
+    if not _get_comm():
+        return 0
+    else:
+        return _comm.Get_rank()
+
+
+def get_size():
+    if not _get_comm():
+        return 1
+    else:
+        return _comm.Get_size()
+
+
+def gather(data, root=0):
+    if not _get_comm():
+        return [data]
+    else:
+        return _comm.gather(data, root=root)
@@ -7,7 +7,7 @@ from pathlib import Path
 from tempfile import TemporaryDirectory, mkdtemp
 
 from . import _mpi
-from ._fs import get_cache_path, read_cache, update_cache
+from ._fs import get_cache_path, read_cache, write_cache
 from ._hash import get_package_hash, get_package_mods_hash
 from .exceptions import *
 
@@ -128,7 +128,8 @@ class Mod:
     def mod_name(self):
         if self.builtin:
             return self.asset_name
-        return ModName(self.pkg_name, self.asset_name, self.variant).full_mod_name
+        # Same as `ModName.full_mod_name`, without building a `ModName` on this hot path.
+        return f"glia__{self.pkg_name}__{self.asset_name}__{self.variant}"
 
     @property
     def arbor_name(self):
@@ -298,7 +299,7 @@ class Catalogue:
         cache_data = read_cache()
         cat_hashes = cache_data.setdefault("cat_hashes", dict())
         cat_hashes[self.name] = self._hash()
-        update_cache(cache_data)
+        write_cache(cache_data)
 
     @contextlib.contextmanager
     def assemble_arbor_mod_dir(self):
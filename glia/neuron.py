@@ -6,12 +6,16 @@ if typing.TYPE_CHECKING:
 
 
 class MechAccessor:
+    # Accessors are created for every insert, keep them small.
+    __slots__ = ("_section_name", "_section", "_mod", "_pp", "_references", "__weakref__")
+
     def __init__(self, section, mod: "Mod", point_process=None):
         self._section_name = section.hname()
         self._section = weakref.proxy(section)
         self._mod = mod
         self._pp = point_process
-        self._references = []
+        # Created on the first reference, most accessors never get one.
+        self._references = None
 
     def __neuron__(self):
         if self._pp is not None:
@@ -29,9 +33,13 @@ class MechAccessor:
             )
 
     def __ref__(self, other):
+        if self._references is None:
+            self._references = []
         self._references.append(other)
 
     def __deref__(self, other):
+        if self._references is None:
+            raise ValueError(f"{other} is not referenced by this accessor.")
         self._references.remove(other)
 
     @property
@@ -71,11 +79,27 @@ class MechAccessor:
 
     def set(self, attribute_or_dict, value=None, /, x=None):
         if value is None:
-            for k, v in attribute_or_dict.items():
-                self.set_parameter(k, v, x)
+            if self._pp is None and x is None:
+                # Resolve the section once for all the parameters.
+                section = self._get_neuron_section()
+                mod = self._mod.mod_name
+                for k, v in attribute_or_dict.items():
+                    setattr(section, f"{k}_{mod}", v)
+            else:
+                for k, v in attribute_or_dict.items():
+                    self.set_parameter(k, v, x)
         else:
             self.set_parameter(attribute_or_dict, value, x)
 
+    def _get_neuron_section(self):
+        try:
+            return self._section.__neuron__()
+        except ReferenceError:
+            raise ReferenceError(
+                "Trying to set attribute on section"
+                f" '{self._section_name}' that has since been garbage collected"
+            )
+
     def set_parameter(self, param, value, x=None):
         mod = self._mod.mod_name
         if self._pp is not None:
@@ -84,11 +108,10 @@ class MechAccessor:
                     f"Point process {self._mod.mod_name} has no parameter '{param}'"
                 )
             return setattr(self._pp, param, value)
+        if x is None:
+            return setattr(self._get_neuron_section(), f"{param}_{mod}", value)
         try:
-            if x is None:
-                setattr(self._section.__neuron__(), f"{param}_{mod}", value)
-            else:
-                setattr(getattr(self._section(x), mod), value)
+            setattr(getattr(self._section(x), mod), param, value)
         except ReferenceError:
             raise ReferenceError(
                 "Trying to set attribute on section"
@@ -43,21 +43,29 @@ class Resolver:
         self.local_preferences = {}
         self.__preference_stack = {}
         self.__next_stack_id = 0
+        self._resolve_cache = {}
         self.construct_index()
 
     def construct_index(self):
-        packages = self._manager.packages
         self.index = {}
         self._reverse_lookup = {}
-        for pkg in packages:
-            for mod in pkg.mods:
-                if mod.dialect is not None and mod.dialect != "neuron":
-                    continue
-                name = mod.asset_name
-                if not name in self.index:
-                    self.index[name] = IndexEntry(name)
-                self.index[name].append(mod)
-                self._reverse_lookup[mod.mod_name] = mod
+        for pkg in self._manager.packages:
+            self.index_package(pkg)
+        self._resolve_cache.clear()
+
+    def index_package(self, pkg):
+        """
+        Add the mods of a package to the index, without rebuilding it.
+        """
+        for mod in pkg.mods:
+            if mod.dialect is not None and mod.dialect != "neuron":
+                continue
+            name = mod.asset_name
+            if not name in self.index:
+                self.index[name] = IndexEntry(name)
+            self.index[name].append(mod)
+            self._reverse_lookup[mod.mod_name] = mod
+        self._resolve_cache.clear()
 
     def resolve(self, asset_name, pkg=None, variant=None):
         if isinstance(asset_name, tuple):
@@ -67,6 +75,16 @@ class Resolver:
             except IndexError:
                 pass
             asset_name = asset_name[0]
+        # Resolution only changes when the index or the preferences do, both of which
+        # clear this cache.
+        key = (asset_name, pkg, variant)
+        mod_name = self._resolve_cache.get(key)
+        if mod_name is None:
+            mod_name = self._resolve(asset_name, pkg, variant)
+            self._resolve_cache[key] = mod_name
+        return mod_name
+
+    def _resolve(self, asset_name, pkg, variant):
         if not asset_name in self.index:
             raise UnknownAssetError(
                 "Selection could not be resolved: Asset '{}' not found.".format(
@@ -116,10 +134,10 @@ class Resolver:
             return None
 
     def lookup(self, mod_name):
-        if mod_name not in self._reverse_lookup:
+        mod = self._reverse_lookup.get(mod_name)
+        if mod is None:
             raise AssetLookupError("No mod with name '{}' found".format(mod_name))
-        else:
-            return self._reverse_lookup[mod_name]
+        return mod
 
     def _get_final_pv(self, asset_name, pkg, variant):
         """
@@ -203,6 +221,7 @@ class Resolver:
             preference["package"] = pkg
         if variant is not None:
             preference["variant"] = variant
+        self._resolve_cache.clear()
         if glbl:
             self.global_preferences[asset_name] = preference
             write_preferences(self.global_preferences)
@@ -227,10 +246,12 @@ class Resolver:
         id = self.__next_stack_id
         self.__next_stack_id += 1
         self.__preference_stack[id] = assets
+        self._resolve_cache.clear()
         return id
 
     def _pop_preference_context(self, id):
         del self.__preference_stack[id]
+        self._resolve_cache.clear()
 
     def _preferences(self):
         pref = self.global_preferences.copy()
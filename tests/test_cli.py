@@ -4,12 +4,14 @@ import shutil
 import unittest
 from pathlib import Path
 from tempfile import TemporaryDirectory
+from unittest import mock
 
 from click import ClickException
 from click.testing import CliRunner
 
 import glia._cli
 import glia._fs
+import glia._glia
 import glia._mpi
 from glia import Mod, Package, get_cache_path
 
@@ -90,6 +92,32 @@ class TestCLI(unittest.TestCase):
     def test_test(self):
         result = run_cli_command(["test", "Na"])
 
+    @_shared.skipParallel
+    @_shared.skipUnlessTestMods
+    def test_test_report(self):
+        result = run_cli_command(["test", "pas", "unknown", "hh"], xfail=True)
+        self.assertEqual(
+            "[OK] pas\n[?] unknown\n[OK] hh\nTests finished: 2 out of 3 passed\n",
+            result.output,
+        )
+        self.assertEqual(1, result.exit_code)
+
+    @_shared.skipParallel
+    def test_test_rank_error(self):
+        # Rank 1 of 2 raised, the main node must not report success for its share.
+        other_rank = ([], "RuntimeError('boom')")
+        with (
+            mock.patch("glia._mpi.get_size", return_value=2),
+            mock.patch("glia._mpi.gather", lambda data: [data, other_rank]),
+            mock.patch.object(
+                glia._glia.Glia, "test_mechanisms", lambda self, m: dict.fromkeys(m)
+            ),
+        ):
+            result = run_cli_command(["test", "pas", "hh"], xfail=True)
+        self.assertNotIn("Tests finished", result.output)
+        self.assertIn("Tests aborted on rank 1: RuntimeError('boom')", result.output)
+        self.assertEqual(1, result.exit_code)
+
     @_shared.skipUnlessTestMods
     def test_test_unknown(self):
         result = run_cli_command(["test", "unknown"], xfail=True)
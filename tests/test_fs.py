@@ -0,0 +1,60 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from glia import _fs
+from glia._fs import get_data_path, get_glia_path, read_storage, write_storage
+
+
+class TestStorage(unittest.TestCase):
+    def setUp(self):
+        # Keep the storage out of the user's data directory.
+        self._tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(_fs, "_get_data_root", return_value=self._tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.file = "test_storage.json"
+        self.path = get_data_path(self.file)
+
+    def tearDown(self):
+        _fs._storage_cache.pop(self.path, None)
+        self._tmp.cleanup()
+
+    def test_external_rewrite(self):
+        write_storage({"value": 1}, self.file)
+        self.assertEqual({"value": 1}, read_storage(self.file))
+        # Rewrite the file behind glia's back, with a payload of the same size.
+        mtime = os.stat(self.path).st_mtime_ns
+        with open(self.path, "w") as f:
+            json.dump({get_glia_path(): {"value": 2}}, f)
+        os.utime(self.path, ns=(mtime + 1_000_000, mtime + 1_000_000))
+        self.assertEqual({"value": 2}, read_storage(self.file), "Stale storage read")
+
+    def test_unchanged_write(self):
+        write_storage({"value": 1}, self.file)
+        with mock.patch.object(_fs, "_write_shared_storage") as write:
+            write_storage({"value": 1}, self.file)
+            write.assert_not_called()
+            write_storage({"value": 2}, self.file)
+            write.assert_called_once()
+
+    def test_roundtrip(self):
+        data = {"hashes": {"pkg": "abcd"}, "list": [1, 2.5, None, True], "str": "é"}
+        for orjson in (_fs.orjson, None):
+            with self.subTest(orjson=orjson), mock.patch.object(_fs, "orjson", orjson):
+                _fs._storage_cache.pop(self.path, None)
+                Path(self.path).unlink(missing_ok=True)
+                write_storage(data, self.file)
+                _fs._storage_cache.pop(self.path)
+                self.assertEqual(data, read_storage(self.file))
+
+    def test_non_str_keys(self):
+        for orjson in (_fs.orjson, None):
+            with self.subTest(orjson=orjson), mock.patch.object(_fs, "orjson", orjson):
+                Path(self.path).unlink(missing_ok=True)
+                write_storage({1: "a", 2.5: "b"}, self.file)
+                _fs._storage_cache.pop(self.path)
+                self.assertEqual({"1": "a", "2.5": "b"}, read_storage(self.file))
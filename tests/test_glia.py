@@ -1,13 +1,130 @@
+import errno
 import os
+import tempfile
 import unittest
+from pathlib import Path
+from unittest import mock
 
 from patch import p
 
 import glia._glia
 from glia._fs import read_cache
+from glia._hash import get_package_mods_hash
+from glia.assets import Mod, Package
 from tests._shared import skipUnlessTestMods
 
 
+class TestExports(unittest.TestCase):
+    """
+    Check that the lazily imported names are part of the public API.
+    """
+
+    def test_star_import(self):
+        namespace = {}
+        exec("from glia import *", namespace)
+        for name in ("Glia", "MechId", "Catalogue", "Mod", "Package", "MechAccessor"):
+            with self.subTest(name=name):
+                self.assertIn(name, namespace)
+        self.assertIs(glia.Glia, namespace["Glia"])
+        self.assertIn("insert", namespace)
+        self.assertIn("GliaError", namespace)
+
+    def test_dir(self):
+        for name in glia._lazy_attrs:
+            with self.subTest(name=name):
+                self.assertIn(name, dir(glia))
+
+
+class TestCacheFreshness(unittest.TestCase):
+    """
+    Check when the compilation cache is considered stale.
+    """
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        root = Path(self._tmp.name)
+        self.mod_path = root / "a.mod"
+        self.mod_path.write_text("NEURON { SUFFIX a }\n")
+        self.manager = glia._glia.Glia()
+        self.manager.packages = [Package("cache_test", root, mods=[Mod("a.mod", "a")])]
+        with mock.patch("glia._glia.read_cache", return_value={"mod_hashes": {}}):
+            self.cache = self.manager._current_cache_data()
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def is_fresh(self):
+        with mock.patch("glia._glia.read_cache", return_value=self.cache):
+            return self.manager.is_cache_fresh()
+
+    def test_fresh(self):
+        self.assertTrue(self.is_fresh())
+
+    def test_fingerprint_mismatch(self):
+        self.cache["build_fingerprint"] = "other-platform"
+        self.assertFalse(self.is_fresh(), "Other build's library reused")
+
+    def test_unchanged_stats(self):
+        with mock.patch("glia.assets.get_package_mods_hash", side_effect=AssertionError):
+            self.assertTrue(self.is_fresh(), "Stored hash not reused")
+
+    def test_changed_mtime(self):
+        mtime = self.mod_path.stat().st_mtime_ns + 1_000_000
+        os.utime(self.mod_path, ns=(mtime, mtime))
+        with mock.patch(
+            "glia.assets.get_package_mods_hash", wraps=get_package_mods_hash
+        ) as hasher:
+            # Touched, but same content.
+            self.assertTrue(self.is_fresh())
+            hasher.assert_called_once()
+
+    def test_changed_size(self):
+        self.mod_path.write_text("NEURON { SUFFIX a RANGE g }\n")
+        with mock.patch(
+            "glia.assets.get_package_mods_hash", wraps=get_package_mods_hash
+        ) as hasher:
+            self.assertFalse(self.is_fresh(), "Changed modfile not detected")
+            hasher.assert_called_once()
+
+    def test_old_cache(self):
+        del self.cache["mod_stats"]
+        del self.cache["build_fingerprint"]
+        self.assertFalse(self.is_fresh(), "Cache without fingerprint reused")
+
+
+class TestLinkOrCopy(unittest.TestCase):
+    """
+    Check that mods are put in the build directory without touching their sources.
+    """
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        root = Path(self._tmp.name)
+        self.a, self.b, self.dst = root / "a.mod", root / "b.mod", root / "dst.mod"
+        self.a.write_text("a")
+        self.b.write_text("b")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_overwrite_link(self):
+        glia._glia._link_or_copy(self.a, self.dst)
+        glia._glia._link_or_copy(self.b, self.dst)
+        self.assertEqual("b", self.dst.read_text())
+        self.assertEqual("a", self.a.read_text(), "Wrote through the earlier link")
+
+    def test_copy_fallback(self):
+        glia._glia._link_or_copy(self.a, self.dst)
+        with mock.patch("os.link", side_effect=OSError(errno.EXDEV, "cross-device")):
+            glia._glia._link_or_copy(self.b, self.dst)
+        self.assertEqual("b", self.dst.read_text())
+        self.assertEqual("a", self.a.read_text(), "Wrote through the earlier link")
+
+    def test_link_error(self):
+        with mock.patch("os.link", side_effect=OSError(errno.EIO, "I/O error")):
+            self.assertRaises(OSError, glia._glia._link_or_copy, self.a, self.dst)
+
+
 @skipUnlessTestMods
 class TestPackageDiscovery(unittest.TestCase):
     """
@@ -108,3 +225,53 @@ class TestBuiltins(unittest.TestCase):
             ],
             "NEURON builtins incorrect",
         )
+
+    def test_test_mechanisms(self):
+        import glia
+
+        mechs = ["pas", "hh", "extracellular", "k_ion", "na_ion", "doesntexist"]
+        # NEURON writes its errors straight to the stderr file descriptor.
+        with tempfile.TemporaryFile() as f:
+            stderr = os.dup(2)
+            os.dup2(f.fileno(), 2)
+            try:
+                with mock.patch.object(
+                    glia._manager, "insert", wraps=glia._manager.insert
+                ) as insert:
+                    errors = glia._manager.test_mechanisms(mechs)
+            finally:
+                os.dup2(stderr, 2)
+                os.close(stderr)
+            f.seek(0)
+            self.assertEqual(b"", f.read(), "NEURON reported errors")
+        self.assertEqual(mechs, list(errors))
+        self.assertEqual([None] * 5, [errors[m] for m in mechs[:-1]])
+        self.assertIsInstance(errors["doesntexist"], glia.ResolveError)
+        # Each mechanism is tested in isolation, on its own Section.
+        sections = [call.args[0] for call in insert.call_args_list]
+        self.assertEqual(5, len({id(s) for s in sections}), "Probe Section shared")
+
+    def test_set_parameter_x(self):
+        import glia
+
+        s = p.Section()
+        s.nseg = 3
+        mech = glia.insert(s, "hh")
+        default = s(0.5 / 3).hh.gnabar
+        mech.set_parameter("gnabar", 0.5, x=0.5)
+        self.assertEqual(
+            [default, 0.5, default], [seg.hh.gnabar for seg in s], "Not set on x only"
+        )
+        self.assertEqual(0.5, mech.get_parameter("gnabar", x=0.5))
+
+    def test_set_dict(self):
+        import glia
+
+        s = p.Section()
+        s.nseg = 3
+        mech = glia.insert(s, "hh")
+        mech.set({"gnabar": 0.5, "gl": 0.002})
+        self.assertEqual([0.5] * 3, [seg.hh.gnabar for seg in s], "Not set on all")
+        self.assertEqual([0.002] * 3, [seg.hh.gl for seg in s], "Not set on all")
+        mech.set({"gkbar": 0.1}, x=0.9)
+        self.assertEqual([0.036, 0.036, 0.1], [seg.hh.gkbar for seg in s])
@@ -26,3 +26,21 @@ class TestResolver(unittest.TestCase):
         # Test the tuple forms
         self.assertEqual(mname, resolver.resolve(("hello",)))
         self.assertEqual(mname, resolver.resolve(("hello", "test_v", "test")))
+
+    def test_resolve_cache(self):
+        pkg = Package(
+            "test",
+            __file__,
+            mods=[
+                m0 := Mod("./doesntexist", "hello"),
+                m1 := Mod("./doesntexist", "hello", variant="test_v"),
+            ],
+        )
+        resolver = Resolver(ManagerMock([pkg]))
+        self.assertEqual(m0.mod_name, resolver.resolve("hello"))
+        # Preference changes should invalidate previous resolutions
+        with resolver.preference_context(variant="test_v"):
+            self.assertEqual(m1.mod_name, resolver.resolve("hello"))
+        self.assertEqual(m0.mod_name, resolver.resolve("hello"))
+        resolver.set_preference("hello", variant="test_v")
+        self.assertEqual(m1.mod_name, resolver.resolve("hello"))